@@ -1,16 +1,21 @@
 import yaml
 import os
+import re
 import requests
 from google import genai
 from google.genai import types
 
 from prompts import *
+from file_manager import SafeLoader
 
 import inspect
 
 from dotenv import load_dotenv
 load_dotenv()
 
+# First ```python fenced block in an LLM response
+_CODE_BLOCK_RE = re.compile(r"```python\n(.*?)```", re.DOTALL)
+
 class AgentFileManager:
     def __init__(
         self, config_path: str = "agentic_config.yml", print_config: bool = False
@@ -27,7 +32,7 @@ class AgentFileManager:
             raise FileNotFoundError(f"Config file {config_path} not found")
 
         with open(config_path, "r") as file:
-            self.config = yaml.safe_load(file)
+            self.config = yaml.load(file, Loader=SafeLoader)
 
         if print_config:
             print(self.config)
@@ -51,13 +56,18 @@ class AgentFileManager:
                 "Google GEN AI API_KEY is not set in the environment variables"
             )
 
-    def generate_sub_tasks(self):
-        try:
-            client_generate_sub_tasks = genai.Client(api_key=self.api_key)
-        except Exception as e:
-            print("Error initializing Google API client:", e)
+        # Single client shared by all LLM calls, so the connection pool is reused
+        self.client = genai.Client(api_key=self.api_key)
+
+        # Function names and loaded module of the functions file, keyed by its mtime
+        self._func_cache: dict[str, tuple[int, list[str]]] = {}
+        self._functions_module = None
+        self._module_attributes = None
+        self._functions_info = None
+        self._functions_info_rendered = None
 
-        response = client_generate_sub_tasks.models.generate_content(
+    def generate_sub_tasks(self):
+        response = self.client.models.generate_content(
             model=self.model,
             config=types.GenerateContentConfig(
                 max_output_tokens=self.config["llm"]["max_output_tokens"],
@@ -70,13 +80,13 @@ class AgentFileManager:
 
     def get_functions_list(self) -> list[str]:
         """
-        Get a list of all function names defined in the specified Python file.
+        Get a list of all top-level function names defined in the specified Python file.
 
         Args:
             file_path (str): Path to the Python file to analyze
 
         Returns:
-            list[str]: List of function names found in the file
+            list[str]: List of public function names found in the file
 
         Error Scenarios:
             - If file_path doesn't exist: Returns empty list
@@ -89,60 +99,139 @@ class AgentFileManager:
         """
         import ast
 
+        file_path = self.config["functions_file_path"]
         try:
-            with open(self.config["functions_file_path"], "r") as file:
+            mtime = os.stat(file_path).st_mtime_ns
+            cached = self._func_cache.get(file_path)
+            if cached is not None and cached[0] == mtime:
+                return list(cached[1])
+
+            with open(file_path, "r") as file:
                 tree = ast.parse(file.read())
 
-            return [
+            functions_list = [
                 node.name
-                for node in ast.walk(tree)
+                for node in tree.body  # Top-level definitions only
                 if isinstance(node, ast.FunctionDef)
+                and not node.name.startswith("_")  # Skip private helpers
             ]
+            self._func_cache[file_path] = (mtime, functions_list)
+            return list(functions_list)
         except Exception as e:
-            print(f"Error reading file {self.config['functions_file_path']}: {e}")
+            print(f"Error reading file {file_path}: {e}")
             return []
 
+    def _load_functions_module(self):
+        """
+        Import the functions file, reusing the loaded module while the file is unchanged.
+
+        Returns:
+            module: The module object built from functions_file_path
+        """
+        import importlib.util
+        import sys
+
+        file_path = self.config["functions_file_path"]
+        mtime = os.stat(file_path).st_mtime_ns
+        if self._functions_module is not None and self._functions_module[0] == mtime:
+            return self._functions_module[1]
+
+        # Make sibling modules of the functions file importable
+        functions_dir = os.path.dirname(os.path.abspath(file_path))
+        if functions_dir not in sys.path:
+            sys.path.insert(0, functions_dir)
+
+        module_name = os.path.splitext(os.path.basename(file_path))[0]
+        spec = importlib.util.spec_from_file_location(module_name, file_path)
+        module = importlib.util.module_from_spec(spec)
+        spec.loader.exec_module(module)
+
+        self._functions_module = (mtime, module)
+        return module
+
     def get_function_information(
         self, functions_list: list[str] = None
     ) -> dict[str, dict]:
+        # Import the module containing the functions
+        module = self._load_functions_module()
+
+        # The full function information only changes when the module is reloaded.
+        # Callers get a copy so they can edit it without touching the cache.
+        use_cache = not functions_list
+        if use_cache and self._functions_info is not None and self._functions_info[0] is module:
+            return {name: dict(info) for name, info in self._functions_info[1].items()}
+
         function_information = {}
         if not functions_list:
             functions_list = self.get_functions_list()
 
-        # Import the module containing the functions
-        import importlib.util
-
-        spec = importlib.util.spec_from_file_location(
-            "functions_module", self.config["functions_file_path"]
-        )
-        module = importlib.util.module_from_spec(spec)
-        spec.loader.exec_module(module)
-
         for function_name in functions_list:
             # Get the actual function object from the module
             function = getattr(module, function_name)
+            signature = inspect.signature(function)
             function_information[function_name] = {
                 "usage": function.__doc__,
-                "arguments": str(inspect.signature(function)),
-                "return_type": str(inspect.signature(function).return_annotation),
+                "arguments": str(signature),
+                "return_type": str(signature.return_annotation),
             }
+        if use_cache:
+            self._functions_info = (
+                module,
+                {name: dict(info) for name, info in function_information.items()},
+            )
         return function_information
 
-    def generate_sub_tasks_with_functions(
-        self, functions_information: dict[str, dict] = None
-    ):
-        if not functions_information:
-            functions_information = self.get_function_information()
+    def _render_function_information(self, functions_information: dict[str, dict]) -> str:
+        """
+        Render function information as compact plain text for the LLM prompt.
 
-        # Initialize Google API client, so that no context is shared with the previous client
-        try:
-            client_generate_sub_tasks_with_functions = genai.Client(
-                api_key=self.api_key
+        Each function is written as its signature followed by its indented docstring,
+        instead of the Python repr of the whole dict.
+
+        Args:
+            functions_information (dict[str, dict]): Output of get_function_information
+
+        Returns:
+            str: One entry per function, separated by blank lines
+        """
+        import textwrap
+
+        entries = []
+        for function_name, information in functions_information.items():
+            usage = inspect.cleandoc(information.get("usage") or "")
+            entries.append(
+                f"- {function_name}{information.get('arguments', '()')}\n"
+                + textwrap.indent(usage, "    ")
             )
-        except Exception as e:
-            print("Error initializing Google API client:", e)
+        return "\n\n".join(entries)
+
+    def _render_default_function_information(self) -> str:
+        """
+        Render the information of every function in the functions file.
+
+        The rendering is reused until the functions module is reloaded.
 
-        response = client_generate_sub_tasks_with_functions.models.generate_content(
+        Returns:
+            str: Output of _render_function_information for get_function_information()
+        """
+        module = self._load_functions_module()
+        cached = self._functions_info_rendered
+        if cached is not None and cached[0] is module:
+            return cached[1]
+
+        rendered = self._render_function_information(self.get_function_information())
+        self._functions_info_rendered = (module, rendered)
+        return rendered
+
+    def _sub_tasks_with_functions_request(
+        self, functions_information: dict[str, dict] = None
+    ) -> dict:
+        if functions_information:
+            rendered_information = self._render_function_information(functions_information)
+        else:
+            rendered_information = self._render_default_function_information()
+
+        return dict(
             model=self.model,
             config=types.GenerateContentConfig(
                 max_output_tokens=self.config["llm"]["max_output_tokens"],
@@ -153,10 +242,28 @@ class AgentFileManager:
                 FUNCTION_INFORMATION_TEMPLATE.format(
                     input_folder_path=self.config["input_folder_path"],
                     output_folder_path=self.config["output_folder_path"],
-                    functions_information=functions_information,
+                    functions_information=rendered_information,
                 )
             ],
         )
+
+    def generate_sub_tasks_with_functions(
+        self, functions_information: dict[str, dict] = None
+    ):
+        response = self.client.models.generate_content(
+            **self._sub_tasks_with_functions_request(functions_information)
+        )
+        print(response.text)
+        return response.text
+
+    async def generate_sub_tasks_with_functions_async(
+        self, functions_information: dict[str, dict] = None
+    ):
+        # Same request as generate_sub_tasks_with_functions, through the client's
+        # async API so the LLM round-trip can overlap with other awaited work
+        response = await self.client.aio.models.generate_content(
+            **self._sub_tasks_with_functions_request(functions_information)
+        )
         print(response.text)
         return response.text
 
@@ -164,38 +271,30 @@ class AgentFileManager:
         # Extract the python code from the response
         # The python code is the code that is between the ```python and ``` tags
         # If no ```python and ``` tags are found, return the response
-        # If multiple ```python and ``` tags are found, return the one in the middle
-        # If no ```python and ``` tags are found, return the response
-        import re
-
-        code_blocks = re.findall(r"```python\n(.*?)```", response, re.DOTALL)
-        if code_blocks:
-            return code_blocks[0]
+        # If multiple ```python and ``` tags are found, return the first one
+        match = _CODE_BLOCK_RE.search(response)
+        if match:
+            return match.group(1)
         else:
             return response
 
     def execute_python_code_safely(self, python_code: str) -> str:
-        import importlib.util
         import os, sys  # We need these for path operations
 
-        # Get the current file's directory and add it to sys.path
-        current_dir = os.path.dirname(os.path.abspath(self.config["functions_file_path"]))
-        if current_dir not in sys.path:
-            sys.path.insert(0, current_dir)
-
         # Import the module containing the functions
-        module_name = os.path.splitext(os.path.basename(self.config["functions_file_path"]))[0]
-        spec = importlib.util.spec_from_file_location(
-            module_name, self.config["functions_file_path"]
-        )
-        module = importlib.util.module_from_spec(spec)
-        spec.loader.exec_module(module)
+        module = self._load_functions_module()
+
+        # Public functions of the module, collected again only when the module is reloaded.
+        # Modules imported by the functions file are left out of the environment.
+        if self._module_attributes is None or self._module_attributes[0] is not module:
+            self._module_attributes = (
+                module,
+                {name: getattr(module, name) for name in self.get_functions_list()},
+            )
 
-        # Create restricted environment with all module attributes
-        restricted_locals = {}
-        for name in dir(module):
-            if not name.startswith('_'):  # Skip private attributes
-                restricted_locals[name] = getattr(module, name)
+        # Create restricted environment with all module attributes, copied so the
+        # executed code cannot leak variables into the next run
+        restricted_locals = dict(self._module_attributes[1])
 
         # Add required modules and variables
         restricted_locals['os'] = os
@@ -1,4 +1,42 @@
-def load_config(config_path: str = "src/file_manager_config.yml") -> dict:
+import asyncio
+import base64
+import errno
+import os
+import shutil
+import zipfile
+from concurrent.futures import ThreadPoolExecutor, as_completed
+
+import requests
+import tinify
+import yaml
+from dotenv import load_dotenv
+from requests.adapters import HTTPAdapter
+
+# Prefer the libyaml C bindings, fall back to pure Python if unavailable
+try:
+    from yaml import CSafeLoader as SafeLoader
+except ImportError:
+    from yaml import SafeLoader
+
+# Read the .env file once at import instead of on every compression
+load_dotenv()
+_TINIFY_KEY = os.getenv("TINYPNG_API_KEY")
+_CONVERTAPI_KEY = os.getenv("CONVERTAPI_API_KEY")
+tinify.key = _TINIFY_KEY
+
+_DEFAULT_CONFIG_PATH = "src/file_manager_config.yml"
+
+# Parsed configs keyed by absolute path, stored as
+# (file mtime, config, flattened {file_type: compression_method} lookup)
+_CONFIG_CACHE: dict[str, tuple[int, dict, dict[str, str]]] = {}
+
+# HTTP session shared by the compression API calls, so keep-alive connections
+# to the same host are reused instead of reconnecting for every file
+_HTTP_SESSION = requests.Session()
+_HTTP_SESSION.mount("https://", HTTPAdapter(pool_connections=4, pool_maxsize=8))
+
+
+def load_config(config_path: str = _DEFAULT_CONFIG_PATH) -> dict:
     """
     Load the configuration from the given path.
 
@@ -16,12 +54,40 @@ def load_config(config_path: str = "src/file_manager_config.yml") -> dict:
 
     Return Scenarios:
         - If config file is valid: Returns the configuration as a dictionary
+        - If config file is unchanged since the last call: Returns the cached dictionary
+
+    Note:
+        The returned dictionary is shared with every other caller of load_config,
+        it must be treated as read-only.
+    """
+    return _load_config_entry(config_path)[1]
+
+
+def _load_config_entry(config_path: str) -> tuple[int, dict, dict[str, str]]:
     """
-    import yaml
+    Return the _CONFIG_CACHE entry for config_path, parsing the file if it changed.
+
+    The compression_method list of single-key dicts is flattened into a
+    {file_type: method} dict at parse time, the first entry for a file type wins.
+    """
+    # Key by absolute path so relative and absolute spellings share one entry
+    config_path = os.path.abspath(config_path)
+    mtime = os.stat(config_path).st_mtime_ns
+    cached = _CONFIG_CACHE.get(config_path)
+    if cached is not None and cached[0] == mtime:
+        return cached
 
     with open(config_path, "r") as file:
-        config = yaml.safe_load(file)
-    return config
+        config = yaml.load(file, Loader=SafeLoader)
+
+    compression_methods = {}
+    if isinstance(config, dict):
+        for method in config.get("compression_method") or []:
+            for file_type, compression_method in method.items():
+                compression_methods.setdefault(file_type, compression_method)
+
+    _CONFIG_CACHE[config_path] = (mtime, config, compression_methods)
+    return _CONFIG_CACHE[config_path]
 
 
 def folder_scanner(folder_path: str) -> tuple[list[str], bool]:
@@ -50,13 +116,15 @@ def folder_scanner(folder_path: str) -> tuple[list[str], bool]:
         - Folder doesn't exist: ([], False)
         - Empty folder: ([], True)
     """
-    import os
+    if not folder_path:
+        return [], False
 
-    if os.path.exists(folder_path):
-        files = [f for f in os.listdir(folder_path) if not f.startswith(".")]
-        return files, True
-    else:
+    try:
+        with os.scandir(folder_path) as entries:
+            files = [entry.name for entry in entries if not entry.name.startswith(".")]
+    except OSError:
         return [], False
+    return files, True
 
 
 def file_type_identifier(file_path: str) -> tuple[str, bool]:
@@ -86,13 +154,12 @@ def file_type_identifier(file_path: str) -> tuple[str, bool]:
         - Hidden file (Unix): '.gitignore' returns ''
         - Multiple dots: 'archive.tar.gz' returns 'gz'
     """
-    import os
-
     if not file_path:
         return "", False
-    extension = os.path.splitext(file_path)[1]
-    if extension.startswith("."):
-        extension = extension[1:]
+    # Leading dots mark hidden files, not extensions
+    _, dot, extension = os.path.basename(file_path).lstrip(".").rpartition(".")
+    if not dot:
+        return "", False
     return extension.upper(), extension != ""
 
 
@@ -121,23 +188,21 @@ def folder_creator(folder_path: str, file_type: str = None) -> bool:
         - All folders created: Returns True
         - Creation failed: Returns False
     """
-    import os
-
-    config = load_config()
-
     folders_created = False
 
+    # The config is only needed when creating folders for every file type
     if file_type is None:
-        file_types = config["file_types"]
+        file_types = load_config()["file_types"]
     else:
         file_types = [file_type]
 
     for file_type in file_types:
         type_folder = os.path.join(folder_path, file_type)
         try:
-            if not os.path.exists(type_folder):
-                os.makedirs(type_folder)
-                folders_created = True
+            os.makedirs(type_folder)
+            folders_created = True
+        except FileExistsError:
+            continue
         except Exception as e:
             print(f"Error creating folder {type_folder}: {e}")
             continue
@@ -169,9 +234,6 @@ def file_mover(
         - File doesn't exist: ("", False)
         - Move failed: ("", False)
     """
-    import os
-    import shutil
-
     if not os.path.exists(source_file_path):
         return "", False
 
@@ -186,13 +248,90 @@ def file_mover(
     new_file_path = os.path.join(category_folder, file_name + file_ext)
 
     try:
-        # Move file to category folder
-        shutil.move(source_file_path, new_file_path)
+        # Move file to category folder, a single rename when on the same filesystem
+        try:
+            os.replace(source_file_path, new_file_path)
+        except OSError as e:
+            if e.errno != errno.EXDEV:
+                raise
+            # Cross-device move, fall back to copy + delete
+            shutil.move(source_file_path, new_file_path)
         return new_file_path, True
     except Exception:
         return "", False
 
 
+def _process_file(
+    file_path: str, target_base_path: str, file_type: str
+) -> tuple[str, bool]:
+    """
+    Move one file into its category folder and compress it, used by batch_process.
+
+    An empty file_type means the file could not be identified and is skipped.
+    """
+    if not file_type:
+        return "", False
+    moved_path, success = file_mover(file_path, target_base_path, file_type)
+    if not success:
+        return "", False
+    return file_compressor(moved_path)
+
+
+def batch_process(
+    file_paths: list[str], target_base_path: str, max_workers: int = 8
+) -> tuple[list[str], bool]:
+    """
+    Move and compress a batch of files concurrently.
+
+    Each file goes through the same sequence as the single-file functions:
+    file_type_identifier -> file_mover -> file_compressor. Files are handled
+    by a thread pool, so network-bound compression of one file overlaps with
+    the others.
+
+    Args:
+        file_paths (list[str]): Paths of the files to move and compress
+        target_base_path (str): Base directory where categorized folders will be created
+        Optional: max_workers (int): Maximum number of files processed at the same time
+
+    Returns:
+        tuple[list[str], bool]: A tuple containing:
+            - list[str]: Paths of the compressed files that succeeded
+            - bool: True if every file was moved and compressed, False otherwise
+
+    Error Scenarios:
+        - If file_paths is None or empty: Returns ([], False)
+        - If a file has no extension: That file is skipped, bool is False
+        - If a file cannot be moved or compressed: That file is skipped, bool is False
+
+    Return Scenarios:
+        - All files processed: (["/path/PDF/a_compressed.pdf", ...], True)
+        - Some files failed: (["/path/PDF/a_compressed.pdf"], False)
+    """
+    if not file_paths:
+        return [], False
+
+    # Identify every file once, then create the category folders up front so
+    # workers don't race to create them
+    file_types = [file_type_identifier(path)[0] for path in file_paths]
+    for file_type in set(file_types) - {""}:
+        folder_creator(target_base_path, file_type)
+
+    compressed_paths = []
+    all_succeeded = True
+    with ThreadPoolExecutor(max_workers=max_workers) as executor:
+        futures = [
+            executor.submit(_process_file, path, target_base_path, file_type)
+            for path, file_type in zip(file_paths, file_types)
+        ]
+        for future in as_completed(futures):
+            compressed_path, success = future.result()
+            if success:
+                compressed_paths.append(compressed_path)
+            else:
+                all_succeeded = False
+    return compressed_paths, all_succeeded
+
+
 def file_compressor(file_path: str) -> tuple[str, bool]:
     """
     Compress the file using the configured compression method for the file type.
@@ -217,11 +356,7 @@ def file_compressor(file_path: str) -> tuple[str, bool]:
         - Successful compression: ("/path/to/compressed.jpg", True)
         - File doesn't exist: ("", False)
     """
-    import os
-    from dotenv import load_dotenv
-    load_dotenv()
-
-    config = load_config()
+    _, config, compression_methods = _load_config_entry(_DEFAULT_CONFIG_PATH)
 
     if not os.path.exists(file_path):
         return "", False
@@ -232,12 +367,7 @@ def file_compressor(file_path: str) -> tuple[str, bool]:
 
 
     # Get compression method from config
-    compression_methods = config["compression_method"]
-    compression_method = None
-    for method in compression_methods:
-        if file_type in method:
-            compression_method = method[file_type]
-            break
+    compression_method = compression_methods.get(file_type)
     
 
     if not compression_method:
@@ -250,18 +380,15 @@ def file_compressor(file_path: str) -> tuple[str, bool]:
         new_file_path = os.path.join(os.path.dirname(file_path), compressed_name)
 
         if compression_method == "zip":
-            import zipfile
-
-            with zipfile.ZipFile(new_file_path, "w", zipfile.ZIP_DEFLATED) as zipf:
+            # Level 1 is several times faster than the default 6 for a slightly larger archive
+            with zipfile.ZipFile(
+                new_file_path, "w", zipfile.ZIP_DEFLATED, compresslevel=1
+            ) as zipf:
                 zipf.write(file_path, os.path.basename(file_path))
             return new_file_path, True
         
         if compression_method == "tinypng":
             print(f"Compressing {file_name}.{file_type.lower()} using tinypng")
-            import os
-            import tinify
-            
-            tinify.key = os.getenv("TINYPNG_API_KEY")
             try:
                 source = tinify.from_file(file_path)
                 compressed = source.to_file(new_file_path)
@@ -274,40 +401,18 @@ def file_compressor(file_path: str) -> tuple[str, bool]:
                
         if compression_method == "convertapi":
             print(f"Compressing {file_name}.{file_type.lower()} using convertapi")
-            import requests
-            import os
-            import base64
-            
             convertapi_url = config["convertapi_url"]
-  
-            with open(file_path, 'rb') as f:
-                encoded_file = base64.b64encode(f.read()).decode('utf-8')
-
-            payload = {
-                "Parameters": [
-                    {
-                        "Name": "File",
-                        "FileValue": {
-                            "Name": file_path.split("/")[-1],
-                            "Data": encoded_file
-                        }
-                    }
-                ]
-            }
-            try:
-                api_key = os.getenv("CONVERTAPI_API_KEY")
-            except Exception as e:
-                print(f"Error getting convertapi api key: {e}")
-                return "", False
 
             headers = {
-                "Authorization": f"Bearer {api_key}",
-                "Content-Type": "application/json"
+                "Authorization": f"Bearer {_CONVERTAPI_KEY}",
             }
 
-            response = requests.post(convertapi_url,
-                                     json=payload,
-                                     headers=headers)
+            # Upload the raw bytes as multipart/form-data, avoiding the 4/3x
+            # base64 expansion and JSON string of the whole file in memory
+            with open(file_path, 'rb') as f:
+                response = _HTTP_SESSION.post(convertapi_url,
+                                              files={"File": (os.path.basename(file_path), f)},
+                                              headers=headers)
 
             if response.status_code == 200:
                 response_data = response.json()
@@ -334,6 +439,23 @@ def file_compressor(file_path: str) -> tuple[str, bool]:
         return "", False
 
 
+async def file_compressor_async(file_path: str) -> tuple[str, bool]:
+    """
+    Awaitable version of file_compressor.
+
+    The compression runs in a worker thread, so several files can be compressed
+    concurrently from async code, e.g.
+    await asyncio.gather(*(file_compressor_async(path) for path in paths)).
+
+    Args:
+        file_path: Path of the file to compress
+
+    Returns:
+        tuple[str, bool]: Same as file_compressor
+    """
+    return await asyncio.to_thread(file_compressor, file_path)
+
+
 # if __name__ == "__main__":
 #     import os
 
@@ -38,4 +38,5 @@ Use the boolean value to determine if the function is successful or not and prov
 Also, raise appropriate error / exception if the function is not successful.
 provide the python code to complete the sub-tasks by using the functions as per the sequence of functions.
 Do not use any functions that are not in the list of functions to complete the sub-tasks.
+Prefer a function that processes a list of files in one call over looping through the files one by one.
 """
@@ -0,0 +1,177 @@
+import asyncio
+import os
+import pathlib
+import types
+import pytest
+import yaml
+import agent_file_manager
+from agent_file_manager import AgentFileManager
+
+
+FUNCTIONS_SOURCE = b'''import json
+
+
+def alpha(x: int) -> int:
+    """Return x unchanged."""
+    return x
+
+
+def _hidden():
+    pass
+'''
+
+
+class StubModels:
+    """Stand-in for client.models, records the requests it is given"""
+
+    def __init__(self):
+        self.requests = []
+
+    def generate_content(self, **kwargs):
+        self.requests.append(kwargs)
+        return types.SimpleNamespace(text="sync response")
+
+
+class StubAsyncModels:
+    """Stand-in for client.aio.models, records the requests it is given"""
+
+    def __init__(self):
+        self.requests = []
+
+    async def generate_content(self, **kwargs):
+        self.requests.append(kwargs)
+        return types.SimpleNamespace(text="async response")
+
+
+class StubClient:
+    """Stand-in for genai.Client, so no API key or network is needed"""
+
+    def __init__(self, api_key=None):
+        self.api_key = api_key
+        self.models = StubModels()
+        self.aio = types.SimpleNamespace(models=StubAsyncModels())
+
+
+def bump_mtime(file_path):
+    """Move the mtime of file_path forward, writes within one clock tick can share an mtime"""
+    mtime_ns = os.stat(file_path).st_mtime_ns + 1_000_000_000
+    os.utime(file_path, ns=(mtime_ns, mtime_ns))
+
+
+# Fixtures
+@pytest.fixture
+def agent(tmp_path, monkeypatch):
+    """Create an agent whose functions file is a small module in tmp_path"""
+    monkeypatch.setenv("API_KEY", "test-key")
+    monkeypatch.setattr(agent_file_manager.genai, "Client", StubClient)
+
+    (tmp_path / "functions.py").write_bytes(FUNCTIONS_SOURCE)
+    config = {
+        "llm": {"model": "test-model", "temperature": 0.1, "max_output_tokens": 100},
+        "functions_file_path": "functions.py",
+        "input_folder_path": "input_folder",
+        "output_folder_path": "output_folder",
+    }
+    config_path = tmp_path / "src" / "agentic_config.yml"
+    config_path.parent.mkdir()
+    config_path.write_bytes(yaml.safe_dump(config).encode("utf-8"))
+    return AgentFileManager(str(config_path))
+
+
+# Tests for get_functions_list
+def test_get_functions_list_skips_private_functions(agent):
+    """Test that only public top-level functions are listed"""
+    assert agent.get_functions_list() == ["alpha"]
+
+
+def test_get_functions_list_returns_a_copy(agent):
+    """Test that mutating the returned list does not change the cached one"""
+    agent.get_functions_list().append("injected")
+    assert agent.get_functions_list() == ["alpha"]
+
+
+# Tests for _load_functions_module
+def test_load_functions_module_cached(agent):
+    """Test that an unchanged functions file is not imported again"""
+    assert agent._load_functions_module() is agent._load_functions_module()
+
+
+def test_load_functions_module_reloads_changed_file(agent):
+    """Test that a functions file with a new mtime is imported again"""
+    module = agent._load_functions_module()
+    functions_file = agent.config["functions_file_path"]
+    pathlib.Path(functions_file).write_bytes(
+        FUNCTIONS_SOURCE + b"\n\ndef beta():\n    pass\n"
+    )
+    bump_mtime(functions_file)
+
+    reloaded = agent._load_functions_module()
+    assert reloaded is not module
+    assert hasattr(reloaded, "beta")
+    assert agent.get_functions_list() == ["alpha", "beta"]
+
+
+# Tests for get_function_information
+def test_get_function_information_returns_a_copy(agent):
+    """Test that editing the returned information leaves the cache and the prompt untouched"""
+    information = agent.get_function_information()
+    information["alpha"]["usage"] = "edited"
+    information["injected"] = {"usage": "edited", "arguments": "()"}
+
+    assert agent.get_function_information() == {
+        "alpha": {
+            "usage": "Return x unchanged.",
+            "arguments": "(x: int) -> int",
+            "return_type": "<class 'int'>",
+        }
+    }
+    prompt = agent._sub_tasks_with_functions_request()["contents"][0]
+    assert "edited" not in prompt
+    assert "injected" not in prompt
+
+
+def test_render_function_information(agent):
+    """Test that each function is rendered as its signature followed by its indented docstring"""
+    rendered = agent._render_function_information(agent.get_function_information())
+    assert rendered == "- alpha(x: int) -> int\n    Return x unchanged."
+    assert rendered in agent._sub_tasks_with_functions_request()["contents"][0]
+
+
+# Tests for execute_python_code_safely
+def test_execute_python_code_safely_exposes_listed_functions_only(agent, monkeypatch):
+    """Test that the executed code sees the listed functions plus os, sys and __file__"""
+    environments = []
+    monkeypatch.setattr(
+        agent_file_manager,
+        "exec",
+        lambda code, globals_, locals_: environments.append(locals_),
+        raising=False,
+    )
+
+    assert agent.execute_python_code_safely("pass") == "Code executed successfully"
+    assert set(environments[0]) == {"alpha", "os", "sys", "__file__"}
+    assert environments[0]["__file__"] == agent.config["functions_file_path"]
+
+
+def test_execute_python_code_safely_hides_module_imports(agent):
+    """Test that modules imported by the functions file and private helpers are not exposed"""
+    assert agent.execute_python_code_safely("json.dumps(alpha(1))") == "name 'json' is not defined"
+    assert agent.execute_python_code_safely("_hidden()") == "name '_hidden' is not defined"
+
+
+def test_execute_python_code_safely_does_not_leak_variables(agent):
+    """Test that a variable assigned by one run is gone on the next run"""
+    assert agent.execute_python_code_safely("leaked = alpha(1)") == "Code executed successfully"
+    assert agent.execute_python_code_safely("print(leaked)") == "name 'leaked' is not defined"
+
+
+# Tests for generate_sub_tasks_with_functions_async
+def test_generate_sub_tasks_with_functions_async_matches_sync(agent):
+    """Test that the async call sends the same request as the sync one"""
+    assert agent.generate_sub_tasks_with_functions() == "sync response"
+    assert asyncio.run(agent.generate_sub_tasks_with_functions_async()) == "async response"
+
+    sync_request = agent.client.models.requests[0]
+    async_request = agent.client.aio.models.requests[0]
+    assert async_request == sync_request
+    assert "- alpha(x: int) -> int" in async_request["contents"][0]
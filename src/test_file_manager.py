@@ -1,7 +1,11 @@
+import asyncio
+import errno
 import os
+import pathlib
 import pytest
 import yaml
 import shutil
+import file_manager
 from file_manager import (
     load_config,
     folder_scanner,
@@ -9,41 +13,84 @@ from file_manager import (
     folder_creator,
     file_mover,
     file_compressor,
+    batch_process,
+    file_compressor_async,
 )
 
+# Dump fixtures with the same libyaml-backed family that load_config reads with
+try:
+    from yaml import CSafeDumper as SafeDumper
+except ImportError:
+    from yaml import SafeDumper
 
-# Fixtures
-@pytest.fixture
-def temp_folder(tmp_path="data/test_folder"):
-    """Create a temporary folder for testing"""
-    if not tmp_path:
-        root_dir = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
-        tmp_path = os.path.join(root_dir, "data", "test_folder")
-    return str(tmp_path)
+# Content of every sample file, pre-encoded so it can be written unbuffered
+PAYLOAD = b"test content"
 
 
-@pytest.fixture
-def empty_folder(empty_folder="empty_folder"):
-    """Create a empty folder for testing"""
-    if not empty_folder:
-        root_dir = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
-        empty_folder = os.path.join(root_dir, "data", "empty_folder")
-    return str(empty_folder)
+def write_payload(file_path):
+    """Write PAYLOAD to file_path with raw os-level calls, skipping the buffered text IO stack"""
+    fd = os.open(file_path, os.O_WRONLY | os.O_CREAT | os.O_TRUNC, 0o644)
+    try:
+        os.write(fd, PAYLOAD)
+    finally:
+        os.close(fd)
 
 
-@pytest.fixture
-def sample_files(temp_folder="data/test_folder"):
-    """Create sample files for testing"""
+def remove_tree(folder_path):
+    """Remove folder_path and its contents, walking it with os.scandir"""
+    with os.scandir(folder_path) as entries:
+        for entry in entries:
+            if entry.is_dir(follow_symlinks=False):
+                remove_tree(entry.path)
+            else:
+                os.unlink(entry.path)
+    os.rmdir(folder_path)
+
+
+# Fixtures
+@pytest.fixture(scope="session")
+def temp_folder(tmp_path_factory):
+    """
+    Create a temporary folder shared by the whole session.
+
+    It only holds the sample files and config.yml, tests that create, move or
+    remove files must use work_folder or tmp_path instead.
+    """
+    # pytest-xdist already gives every worker its own base temp directory, the
+    # worker id suffix only labels the folder, plain runs get no suffix
+    worker = os.environ.get("PYTEST_XDIST_WORKER")
+    folder = str(tmp_path_factory.mktemp(f"test_folder_{worker}" if worker else "test_folder"))
+    yield folder
+    # Single teardown for everything the tests left behind
+    remove_tree(folder)
+
+
+@pytest.fixture(scope="session")
+def empty_folder(tmp_path_factory):
+    """Path of a folder that is never created, unique to this session"""
+    return str(tmp_path_factory.getbasetemp() / "empty_folder")
+
+
+@pytest.fixture(scope="session")
+def sample_files(temp_folder):
+    """Create sample files once for the whole test session"""
     # Create test files
     files = ["test.pdf", "image.jpg", "document.PNG"]
     for file in files:
-        with open(os.path.join(temp_folder, file), "w") as f:
-            f.write("test content")
+        write_payload(os.path.join(temp_folder, file))
     return files
 
 
 @pytest.fixture
-def config_file(temp_folder="data/test_folder"):
+def work_folder(tmp_path, sample_files):
+    """Create a per-test copy of the sample files for tests that move or add files"""
+    for file in sample_files:
+        write_payload(os.path.join(tmp_path, file))
+    return str(tmp_path)
+
+
+@pytest.fixture(scope="session")
+def config_file(temp_folder):
     """Create a temporary config file"""
     config = {
         "file_manager": {
@@ -52,8 +99,9 @@ def config_file(temp_folder="data/test_folder"):
         }
     }
     config_path = os.path.join(temp_folder, "config.yml")
-    with open(config_path, "w") as f:
-        yaml.dump(config, f)
+    pathlib.Path(config_path).write_bytes(
+        yaml.dump(config, Dumper=SafeDumper).encode("utf-8")
+    )
     return config_path
 
 
@@ -67,8 +115,42 @@ def test_load_config(config_file):
     assert "PDF" in config["file_manager"]["file_types"]
 
 
+def test_load_config_cached(config_file):
+    """Test that an unchanged config file is not re-parsed"""
+    assert load_config(config_file) is load_config(config_file)
+
+
+def test_load_config_reloads_changed_file(tmp_path):
+    """Test that a config file with a new mtime is parsed again"""
+    config_path = os.path.join(tmp_path, "config.yml")
+    pathlib.Path(config_path).write_bytes(b"file_types: [PDF]\n")
+    assert load_config(config_path)["file_types"] == ["PDF"]
+
+    pathlib.Path(config_path).write_bytes(b"file_types: [PNG]\n")
+    # Force a different mtime, writes within the same clock tick can share one
+    mtime_ns = os.stat(config_path).st_mtime_ns + 1_000_000_000
+    os.utime(config_path, ns=(mtime_ns, mtime_ns))
+    assert load_config(config_path)["file_types"] == ["PNG"]
+
+
+def test_load_config_first_compression_method_wins(tmp_path):
+    """Test that the first compression_method entry for a file type is used"""
+    config_path = os.path.join(tmp_path, "config.yml")
+    pathlib.Path(config_path).write_bytes(
+        b"compression_method:\n"
+        b"  - PDF: zip\n"
+        b"  - JPG: tinify\n"
+        b"  - PDF: convertapi\n"
+    )
+    load_config(config_path)
+    assert file_manager._load_config_entry(config_path)[2] == {
+        "PDF": "zip",
+        "JPG": "tinify",
+    }
+
+
 # Tests for folder_scanner
-def test_folder_scanner_with_files(temp_folder, sample_files):
+def test_folder_scanner_with_files(temp_folder, sample_files, config_file):
     """Test scanning folder with files"""
     files, exists = folder_scanner(temp_folder)
     assert exists is True
@@ -90,56 +172,77 @@ def test_folder_scanner_empty_folder(empty_folder):
     assert len(files) == 0
 
 
+def regular_file_path(tmp_path):
+    """Return the path of a regular file in tmp_path"""
+    file_path = os.path.join(tmp_path, "test.txt")
+    write_payload(file_path)
+    return file_path
+
+
+@pytest.mark.parametrize(
+    "make_path",
+    [lambda tmp_path: None, lambda tmp_path: "", regular_file_path],
+    ids=["none", "empty_string", "regular_file"],
+)
+def test_folder_scanner_invalid_path(tmp_path, make_path):
+    """Test scanning a path that is not a folder"""
+    assert folder_scanner(make_path(tmp_path)) == ([], False)
+
+
 # Tests for file_type_identifier
-def test_file_type_identifier_valid_files():
-    """Test identifying valid file types"""
-    test_cases = [
+@pytest.mark.parametrize(
+    "input_path,expected",
+    [
         ("document.PDF", ("PDF", True)),
         ("image.jpg", ("JPG", True)),
         ("test.PNG", ("PNG", True)),
-    ]
-    for input_path, expected in test_cases:
-        assert file_type_identifier(input_path) == expected
+    ],
+)
+def test_file_type_identifier_valid_files(input_path, expected):
+    """Test identifying valid file types"""
+    assert file_type_identifier(input_path) == expected
 
 
-def test_file_type_identifier_invalid_files():
-    """Test identifying invalid file types"""
-    test_cases = [
+@pytest.mark.parametrize(
+    "input_path,expected",
+    [
         ("", ("", False)),
         (None, ("", False)),
         ("file_without_extension", ("", False)),
         (".hidden", ("", False)),
-    ]
-    for input_path, expected in test_cases:
-        assert file_type_identifier(input_path) == expected
+    ],
+)
+def test_file_type_identifier_invalid_files(input_path, expected):
+    """Test identifying invalid file types"""
+    assert file_type_identifier(input_path) == expected
 
 
 # Tests for folder_creator
-def test_folder_creator_single_type(temp_folder):
+def test_folder_creator_single_type(tmp_path):
     """Test creating folder for single file type"""
-    assert folder_creator(temp_folder, "PDF") is True
-    assert os.path.exists(os.path.join(temp_folder, "PDF"))
+    assert folder_creator(str(tmp_path), "PDF") is True
+    assert os.path.exists(os.path.join(tmp_path, "PDF"))
 
 
-def test_folder_creator_all_types(temp_folder, config_file):
+def test_folder_creator_all_types(tmp_path, config_file):
     """Test creating folders for all file types"""
-    assert folder_creator(temp_folder) is True
+    assert folder_creator(str(tmp_path)) is True
     config = load_config()
     for file_type in config["file_manager"]["file_types"]:
-        assert os.path.exists(os.path.join(temp_folder, file_type))
+        assert os.path.exists(os.path.join(tmp_path, file_type))
 
 
-def test_folder_creator_existing_folders(temp_folder):
+def test_folder_creator_existing_folders(tmp_path):
     """Test creating folders that already exist"""
-    os.makedirs(os.path.join(temp_folder, "PDF"), exist_ok=True)
-    assert folder_creator(temp_folder, "PDF") is False
+    os.makedirs(os.path.join(tmp_path, "PDF"), exist_ok=True)
+    assert folder_creator(str(tmp_path), "PDF") is False
 
 
 # Tests for file_mover
-def test_file_mover_success(temp_folder, sample_files):
+def test_file_mover_success(work_folder):
     """Test successful file moving"""
-    source_file = os.path.join(temp_folder, "test.pdf")
-    new_path, success = file_mover(source_file, temp_folder, "PDF")
+    source_file = os.path.join(work_folder, "test.pdf")
+    new_path, success = file_mover(source_file, work_folder, "PDF")
     assert success is True
     assert os.path.exists(new_path)
     assert not os.path.exists(source_file)
@@ -154,12 +257,44 @@ def test_file_mover_nonexistent_file(temp_folder):
     assert new_path == ""
 
 
+
+def test_file_mover_cross_device(work_folder, monkeypatch):
+    """Test that a cross-device rename falls back to shutil.move"""
+    def cross_device_replace(src, dst):
+        raise OSError(errno.EXDEV, "Invalid cross-device link")
+
+    monkeypatch.setattr(file_manager.os, "replace", cross_device_replace)
+    source_file = os.path.join(work_folder, "test.pdf")
+    new_path, success = file_mover(source_file, work_folder, "PDF")
+    assert success is True
+    assert new_path == os.path.join(work_folder, "PDF", "test.pdf")
+    assert os.path.exists(new_path)
+    assert not os.path.exists(source_file)
+
+
+def test_file_mover_replace_error(work_folder, monkeypatch):
+    """Test that any other rename error is reported as a failed move"""
+    def failing_replace(src, dst):
+        raise OSError(errno.EACCES, "Permission denied")
+
+    monkeypatch.setattr(file_manager.os, "replace", failing_replace)
+    source_file = os.path.join(work_folder, "test.pdf")
+    assert file_mover(source_file, work_folder, "PDF") == ("", False)
+    assert os.path.exists(source_file)
+
+
 # Tests for file_compressor
-def test_file_compressor_success(temp_folder, sample_files, config_file):
+def test_file_compressor_success(work_folder, config_file):
     """Test successful file compression"""
-    test_file = os.path.join(temp_folder, "PDF", "test.pdf")
-    os.makedirs(os.path.join(temp_folder, "PDF"), exist_ok=True)
-    shutil.copy(os.path.join(temp_folder, "test.pdf"), test_file)
+    pdf_folder = os.path.join(work_folder, "PDF")
+    test_file = os.path.join(pdf_folder, "test.pdf")
+    os.makedirs(pdf_folder, exist_ok=True)
+    source_file = os.path.join(work_folder, "test.pdf")
+    try:
+        # Hardlink instead of copying, falls back to a copy across filesystems
+        os.link(source_file, test_file)
+    except OSError:
+        shutil.copy(source_file, test_file)
 
     compressed_path, success = file_compressor(test_file)
     assert success is True
@@ -176,14 +311,84 @@ def test_file_compressor_nonexistent_file(temp_folder):
     assert compressed_path == ""
 
 
-def test_file_compressor_unsupported_type(temp_folder, sample_files, config_file):
+def test_file_compressor_async_nonexistent_file(temp_folder):
+    """Test compressing non-existent file from async code"""
+    compressed_path, success = asyncio.run(
+        file_compressor_async(os.path.join(temp_folder, "nonexistent.pdf"))
+    )
+    assert success is False
+    assert compressed_path == ""
+
+
+def test_file_compressor_async_gather(monkeypatch):
+    """Test that concurrent async calls each go through file_compressor"""
+    monkeypatch.setattr(
+        file_manager, "file_compressor", lambda file_path: (file_path + ".zip", True)
+    )
+
+    async def compress_all(file_paths):
+        return await asyncio.gather(*(file_compressor_async(path) for path in file_paths))
+
+    file_paths = ["a.txt", "b.pdf", "c.png"]
+    assert asyncio.run(compress_all(file_paths)) == [
+        ("a.txt.zip", True),
+        ("b.pdf.zip", True),
+        ("c.png.zip", True),
+    ]
+
+
+def test_file_compressor_unsupported_type(work_folder, config_file):
     """Test compressing file with unsupported type"""
     # Create a file type not in compression methods
-    test_file = os.path.join(temp_folder, "UNSUPPORTED", "test.txt")
-    os.makedirs(os.path.join(temp_folder, "UNSUPPORTED"), exist_ok=True)
-    with open(test_file, "w") as f:
-        f.write("test content")
+    unsupported_folder = os.path.join(work_folder, "UNSUPPORTED")
+    test_file = os.path.join(unsupported_folder, "test.txt")
+    os.makedirs(unsupported_folder, exist_ok=True)
+    write_payload(test_file)
 
     compressed_path, success = file_compressor(test_file)
     assert success is False
     assert compressed_path == ""
+
+
+# Tests for batch_process
+def test_batch_process_empty_list(temp_folder):
+    """Test batch processing with no files"""
+    assert batch_process([], temp_folder) == ([], False)
+
+
+def test_batch_process_file_without_extension(work_folder):
+    """Test batch processing a file that cannot be categorized"""
+    test_file = os.path.join(work_folder, "file_without_extension")
+    write_payload(test_file)
+
+    compressed_paths, success = batch_process([test_file], work_folder)
+    assert success is False
+    assert compressed_paths == []
+    assert os.path.exists(test_file)
+
+
+def test_batch_process_multiple_files_without_compression(work_folder):
+    """Test batch processing several files whose type has no compression method"""
+    test_files = [os.path.join(work_folder, name) for name in ("a.txt", "b.txt")]
+    for test_file in test_files:
+        write_payload(test_file)
+
+    assert batch_process(test_files, work_folder) == ([], False)
+    for name in ("a.txt", "b.txt"):
+        assert os.path.exists(os.path.join(work_folder, "TXT", name))
+        assert not os.path.exists(os.path.join(work_folder, name))
+
+
+def test_batch_process_success(work_folder, monkeypatch):
+    """Test batch processing combines the results of every file"""
+    monkeypatch.setattr(
+        file_manager, "file_compressor", lambda file_path: (file_path + ".zip", True)
+    )
+    test_files = [os.path.join(work_folder, name) for name in ("test.pdf", "image.jpg")]
+
+    compressed_paths, success = batch_process(test_files, work_folder)
+    assert success is True
+    assert sorted(compressed_paths) == [
+        os.path.join(work_folder, "JPG", "image.jpg.zip"),
+        os.path.join(work_folder, "PDF", "test.pdf.zip"),
+    ]